@@ -5,9 +5,12 @@ setup(
     name='vispy',
     version='0.0.1',
     packages=find_packages(),
-    install_requires=[
-        'graphviz',
-    ],
+    extras_require={
+        'fast-parse': [
+            'tree-sitter',
+            'tree-sitter-python',
+        ],
+    },
     entry_points={
         'console_scripts': [
             'vispy=vispy.cli:main',
@@ -19,8 +22,10 @@ setup(
     long_description=open('README.md').read(),
     long_description_content_type='text/markdown',
     url='https://github.com/lckylke/vispy',
+    python_requires='>=3.10',
     classifiers=[
         'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: 3.10',
         'License :: OSI Approved :: MIT License',
     ],
 )
@@ -2,97 +2,188 @@
 
 import ast
 import sys
-import graphviz
-import itertools
+import hashlib
 import os
-import argparse
-
-class HierarchyExtractor(ast.NodeVisitor):
-    def __init__(self):
-        self.classes = {}  # class name -> class info
-
-    def visit_ClassDef(self, node):
-        class_info = {'methods': set(), 'variables': set(), 'bases': []}
-        class_info['bases'] = [self.get_name(base) for base in node.bases]
-        # methods and variables
-        for body_item in node.body:
-            if isinstance(body_item, ast.FunctionDef):
-                # method
-                method_name = body_item.name
-                # Skip trivial methods like __init__
-                if not (method_name.startswith('__') and method_name.endswith('__')):
-                    class_info['methods'].add(method_name)
-                    # process method body to find instance variables
-                    self.process_method(body_item, class_info)
-            elif isinstance(body_item, ast.Assign):
-                # class variable
-                for target in body_item.targets:
-                    if isinstance(target, ast.Name):
-                        var_name = target.id
-                        class_info['variables'].add(var_name)
-                    elif isinstance(target, ast.Tuple):
-                        # multiple assignment
-                        for elt in target.elts:
-                            if isinstance(elt, ast.Name):
-                                var_name = elt.id
-                                class_info['variables'].add(var_name)
-            elif isinstance(body_item, ast.AnnAssign):
-                # annotated class variable
-                if isinstance(body_item.target, ast.Name):
-                    var_name = body_item.target.id
-                    class_info['variables'].add(var_name)
-        self.classes[node.name] = class_info
-        self.generic_visit(node)
-
-    def process_method(self, node, class_info):
-        # Process method body to find instance variables
-        for stmt in ast.walk(node):
-            if isinstance(stmt, ast.Assign):
-                for target in stmt.targets:
-                    if isinstance(target, ast.Attribute):
-                        if (isinstance(target.value, ast.Name) and
-                            target.value.id == 'self'):
-                            # instance variable
-                            var_name = target.attr
-                            class_info['variables'].add(var_name)
-            elif isinstance(stmt, ast.AnnAssign):
-                # annotated assignment
-                if (isinstance(stmt.target, ast.Attribute) and
-                    isinstance(stmt.target.value, ast.Name) and
-                    stmt.target.value.id == 'self'):
-                    var_name = stmt.target.attr
-                    class_info['variables'].add(var_name)
-
-    def get_name(self, node):
-        if isinstance(node, ast.Name):
-            return node.id
-        elif isinstance(node, ast.Attribute):
-            return self.get_name(node.value) + '.' + node.attr
-        else:
-            return None
+import pickle
+import pickletools
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+
+TOOL_VERSION = '0.0.1'
+CACHE_DIR = '.vispy_cache'
+# Bump when the pickled cache layout or extraction semantics change
+# (e.g. ClassInfo replacing dicts, newly recognized assignment targets).
+CACHE_FORMAT = 3
+
+# Below this many input files the process-pool startup cost outweighs
+# the parallel parsing win.
+PARALLEL_MIN_FILES = 4
+# A single file with this many top-level classes is worth fanning out
+# class-by-class instead; below it the fork/pickle overhead dominates.
+PARALLEL_MIN_CLASSES = 32
+# Files at least this large are parsed with tree-sitter when the optional
+# dependency is installed; small files are not worth the second parser.
+TREE_SITTER_MIN_BYTES = 1 << 20
+
+COLOR_PALETTE = ['palegoldenrod', 'lightgreen', 'lightpink', 'lightcyan', 'lavender', 'lightcoral', 'aquamarine']
+
+@dataclass(slots=True)
+class ClassInfo:
+    """Methods, variables and bases extracted from one class definition."""
+    methods: set[str] = field(default_factory=set)
+    variables: set[str] = field(default_factory=set)
+    bases: list[str | None] = field(default_factory=list)
+
+def _is_self_attr(target: ast.expr) -> bool:
+    """Return True if the node is an attribute access on `self`."""
+    return (isinstance(target, ast.Attribute) and
+            isinstance(target.value, ast.Name) and
+            target.value.id == 'self')
+
+def extract_classes(tree: ast.AST, out: dict[str, ClassInfo]) -> None:
+    """
+    Collect class information for every class definition in a parsed tree.
+
+    Args:
+        tree (ast.AST): The parsed module.
+        out (dict): Dictionary to fill with class name -> class info.
+    """
+    # Iterating the tree directly avoids the NodeVisitor dispatch machinery;
+    # only ClassDef nodes matter here, and a class definition can only
+    # appear as a statement, so expression subtrees are never descended.
+    queue = deque([tree])
+    while queue:
+        node = queue.popleft()
+        if isinstance(node, ast.ClassDef):
+            out[node.name] = _analyze_class(node)
+        queue.extend(child for child in ast.iter_child_nodes(node)
+                     if isinstance(child, (ast.stmt, ast.excepthandler, ast.match_case)))
+
+def _handle_method(body_item: ast.FunctionDef, class_info: ClassInfo) -> None:
+    # method
+    method_name = sys.intern(body_item.name)
+    # Skip trivial methods like __init__
+    if not (method_name.startswith('__') and method_name.endswith('__')):
+        class_info.methods.add(method_name)
+        # process method body to find instance variables
+        _process_method(body_item, class_info)
+
+def _handle_class_assign(body_item: ast.Assign, class_info: ClassInfo) -> None:
+    # class variable
+    for target in body_item.targets:
+        if isinstance(target, ast.Name):
+            class_info.variables.add(sys.intern(target.id))
+        elif isinstance(target, (ast.Tuple, ast.List)):
+            # multiple assignment
+            for elt in target.elts:
+                if isinstance(elt, ast.Name):
+                    class_info.variables.add(sys.intern(elt.id))
+
+def _handle_class_annassign(body_item: ast.AnnAssign, class_info: ClassInfo) -> None:
+    # annotated class variable
+    if isinstance(body_item.target, ast.Name):
+        class_info.variables.add(sys.intern(body_item.target.id))
 
-def get_all_bases(class_name, classes, visited=None):
+# Dispatch class-body statements on their exact type: a dict lookup beats
+# an isinstance cascade and skips docstrings/Expr/Pass nodes outright.
+_BODY_HANDLERS = {
+    ast.FunctionDef: _handle_method,
+    ast.Assign: _handle_class_assign,
+    ast.AnnAssign: _handle_class_annassign,
+}
+
+def _analyze_class(node: ast.ClassDef) -> ClassInfo:
+    """
+    Extract methods, variables and bases from a class definition.
+
+    Args:
+        node (ast.ClassDef): The class definition node.
+
+    Returns:
+        ClassInfo: The extracted methods, variables and bases.
+    """
+    class_info = ClassInfo()
+    class_info.bases = [_get_name(base) for base in node.bases]
+    # methods and variables
+    for body_item in node.body:
+        handler = _BODY_HANDLERS.get(type(body_item))
+        if handler is not None:
+            handler(body_item, class_info)
+    return class_info
+
+# Exact-type sets for the method-body walk; ast statement nodes are
+# concrete, so `type(x) in set` beats isinstance's tuple scan per node.
+_PRUNE_TYPES = frozenset({ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef})
+_ASSIGN_TYPES = frozenset({ast.Assign, ast.AnnAssign})
+
+def _process_method(node: ast.FunctionDef, class_info: ClassInfo) -> None:
+    # Process method body to find instance variables. Walk iteratively
+    # and prune nested functions/classes, which shadow `self`.
+    stack = list(node.body)
+    while stack:
+        stmt = stack.pop()
+        stmt_type = type(stmt)
+        if stmt_type in _PRUNE_TYPES:
+            continue
+        if stmt_type in _ASSIGN_TYPES:
+            targets = stmt.targets if stmt_type is ast.Assign else [stmt.target]
+            for target in targets:
+                if isinstance(target, (ast.Tuple, ast.List)):
+                    # unpacking assignment, e.g. self.a, self.b = ...
+                    for elt in target.elts:
+                        if _is_self_attr(elt):
+                            class_info.variables.add(sys.intern(elt.attr))
+                elif _is_self_attr(target):
+                    class_info.variables.add(sys.intern(target.attr))
+        # Only statements (and the blocks of try/match arms) can contain
+        # further assignments; skipping expression subtrees avoids
+        # visiting the bulk of the nodes in a typical method body.
+        stack.extend(child for child in ast.iter_child_nodes(stmt)
+                     if isinstance(child, (ast.stmt, ast.excepthandler, ast.match_case)))
+
+def _get_name(node: ast.expr) -> str | None:
+    # Build dotted names iteratively: one join instead of a Python-level
+    # call and a string concatenation per attribute in the chain.
+    if isinstance(node, ast.Name):
+        return node.id
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    parts.reverse()
+    return '.'.join(parts)
+
+def get_all_bases(class_name, classes):
     """
-    Recursively collect all base classes for a given class.
+    Collect all transitive base classes for a given class.
+
+    Walks the inheritance graph iteratively, so deep hierarchies neither
+    recurse nor allocate per level, and cycles terminate naturally.
 
     Args:
         class_name (str): The name of the class.
         classes (dict): Dictionary containing class information.
-        visited (set): Set of already visited classes to avoid infinite loops.
 
     Returns:
         set: A set of all base class names.
     """
-    if visited is None:
-        visited = set()
     bases = set()
     if class_name not in classes:
         return bases
-    for base in classes[class_name]['bases']:
-        if base and base not in visited:
-            visited.add(base)
-            bases.add(base)
-            bases.update(get_all_bases(base, classes, visited))
+    stack = [base for base in classes[class_name].bases if base]
+    while stack:
+        base = stack.pop()
+        if base in bases:
+            continue
+        bases.add(base)
+        if base in classes:
+            stack.extend(b for b in classes[base].bases if b)
     return bases
 
 def collect_inherited_elements(class_name, classes):
@@ -110,11 +201,438 @@ def collect_inherited_elements(class_name, classes):
     inherited_variables = set()
     base_classes = get_all_bases(class_name, classes)
     for base in base_classes:
-        inherited_methods.update(classes.get(base, {}).get('methods', set()))
-        inherited_variables.update(classes.get(base, {}).get('variables', set()))
+        info = classes.get(base)
+        if info is not None:
+            inherited_methods.update(info.methods)
+            inherited_variables.update(info.variables)
     return inherited_methods, inherited_variables
 
+@dataclass
+class SharingData:
+    """
+    Shared/unique member analysis for a set of focus classes.
+
+    Holds everything both visualization functions need, so the analysis
+    is computed once per run instead of once per visualization.
+    """
+    effective_methods: dict
+    effective_variables: dict
+    all_focus_methods: dict
+    all_focus_variables: dict
+    unique_methods: dict
+    unique_variables: dict
+    sharing_colors: dict
+    inherited: dict
+    sorted_shared_methods: dict
+    sorted_shared_variables: dict
+    sorted_unique_methods: dict
+    sorted_unique_variables: dict
+
+def compute_sharing(classes, focus_classes, include_inherited=False):
+    """
+    Compute shared and unique methods/variables among focus classes.
+
+    Args:
+        classes (dict): Dictionary containing class information.
+        focus_classes (list): List of focus class names.
+        include_inherited (bool): Whether to include inherited methods/variables.
+
+    Returns:
+        SharingData: The per-class, per-combination sharing analysis.
+    """
+    # Branch once on include_inherited instead of re-testing it per class:
+    # without inherited members there is no reason to walk the hierarchy
+    # or build union sets at all.
+    if include_inherited:
+        # Memoize inheritance walks: the same class's inherited elements
+        # are needed once per combination below.
+        inherited = {c: collect_inherited_elements(c, classes) for c in focus_classes if c in classes}
+        effective_methods = {c: classes[c].methods | inherited[c][0] for c in inherited}
+        effective_variables = {c: classes[c].variables | inherited[c][1] for c in inherited}
+    else:
+        inherited = {}
+        effective_methods = {c: classes[c].methods for c in focus_classes if c in classes}
+        effective_variables = {c: classes[c].variables for c in focus_classes if c in classes}
+
+    # Partition members by the set of focus classes owning them. One linear
+    # scan replaces intersecting every combination of focus classes: the
+    # owner set of a member *is* the combination it belongs to. Owner sets
+    # are tracked as int bitmasks (bit i = focus class i), which or-together
+    # and hash cheaper than sets; masks are expanded back to frozenset
+    # combinations only for the groups that actually occur.
+    focus_order = list(effective_methods)
+    method_mask = defaultdict(int)
+    variable_mask = defaultdict(int)
+    for i, c in enumerate(focus_order):
+        bit = 1 << i
+        for m in effective_methods[c]:
+            method_mask[m] |= bit
+        for v in effective_variables[c]:
+            variable_mask[v] |= bit
+
+    def _combo(mask, _memo={}):
+        combo = _memo.get(mask)
+        if combo is None:
+            combo = _memo[mask] = frozenset(
+                focus_order[i] for i in range(mask.bit_length()) if mask >> i & 1)
+        return combo
+
+    # A member is unique exactly when its mask is a single bit (a power of
+    # two); everything else with two or more bits set is shared.
+    all_focus_methods = defaultdict(set)
+    all_focus_variables = defaultdict(set)
+    unique_methods = {c: set() for c in focus_classes}
+    unique_variables = {c: set() for c in focus_classes}
+    for m, mask in method_mask.items():
+        if mask & (mask - 1):
+            all_focus_methods[_combo(mask)].add(m)
+        else:
+            unique_methods[focus_order[mask.bit_length() - 1]].add(m)
+    for v, mask in variable_mask.items():
+        if mask & (mask - 1):
+            all_focus_variables[_combo(mask)].add(v)
+        else:
+            unique_variables[focus_order[mask.bit_length() - 1]].add(v)
+
+    # Assign colors to combinations
+    sharing_colors = {}
+    color_index = 0
+    for combo in all_focus_methods.keys() | all_focus_variables.keys():
+        if combo not in sharing_colors:
+            sharing_colors[combo] = COLOR_PALETTE[color_index % len(COLOR_PALETTE)]
+            color_index += 1
+
+    # Sort each shared/unique set once; the label loops would otherwise
+    # re-sort the same set for every class that displays it.
+    sorted_shared_methods = {combo: sorted(s) for combo, s in all_focus_methods.items()}
+    sorted_shared_variables = {combo: sorted(s) for combo, s in all_focus_variables.items()}
+    sorted_unique_methods = {c: sorted(s) for c, s in unique_methods.items()}
+    sorted_unique_variables = {c: sorted(s) for c, s in unique_variables.items()}
+
+    return SharingData(
+        effective_methods=effective_methods,
+        effective_variables=effective_variables,
+        all_focus_methods=all_focus_methods,
+        all_focus_variables=all_focus_variables,
+        unique_methods=unique_methods,
+        unique_variables=unique_variables,
+        sharing_colors=sharing_colors,
+        inherited=inherited,
+        sorted_shared_methods=sorted_shared_methods,
+        sorted_shared_variables=sorted_shared_variables,
+        sorted_unique_methods=sorted_unique_methods,
+        sorted_unique_variables=sorted_unique_variables,
+    )
+
+def collect_inheritance_edges(classes):
+    """
+    Collect (base, subclass) pairs for all known classes.
+
+    Args:
+        classes (dict): Dictionary containing class information.
+
+    Returns:
+        list: (base, subclass) name pairs where both classes are known.
+    """
+    return [(base, class_name)
+            for class_name, class_info in classes.items()
+            for base in class_info.bases
+            if base and base in classes]
+
+def _cache_path(source):
+    """
+    Compute the cache file path for a piece of source code.
+
+    The key is the SHA-256 of the source text combined with the Python
+    version, tool version and cache format, so caches invalidate
+    automatically when the source, interpreter or vispy itself changes.
+
+    Args:
+        source (bytes): The source code of the analyzed file.
+
+    Returns:
+        str: Path of the cache file inside CACHE_DIR.
+    """
+    hasher = hashlib.sha256(source)
+    hasher.update(f'py{sys.version_info.major}.{sys.version_info.minor}-vispy{TOOL_VERSION}-fmt{CACHE_FORMAT}'.encode())
+    return os.path.join(CACHE_DIR, hasher.hexdigest() + '.pkl')
+
+def load_cached_classes(source):
+    """
+    Load previously extracted class information for unchanged source.
+
+    Args:
+        source (bytes): The source code of the analyzed file.
+
+    Returns:
+        dict or None: The cached classes dict, or None on a cache miss.
+    """
+    cache_file = _cache_path(source)
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            # A corrupt or truncated entry can raise nearly anything from
+            # the unpickler; treat every failure as a miss and re-parse.
+            pass
+    return None
+
+def store_cached_classes(source, extracted):
+    """
+    Persist extracted class information so later runs can skip parsing.
+
+    Args:
+        source (bytes): The source code of the analyzed file.
+        extracted (dict): Class information extracted from the source.
+    """
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Optimizing the pickle stream shrinks the file and speeds up
+        # the loads that every subsequent run pays for.
+        payload = pickletools.optimize(pickle.dumps(extracted))
+        # Write to a temp file and rename into place so concurrent runs
+        # over the same source never observe a torn entry.
+        cache_file = _cache_path(source)
+        tmp_file = f'{cache_file}.{os.getpid()}.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass
+
+def _extract_focus_only(tree, focus_classes, out):
+    """
+    Extract class information, analyzing only the bodies that matter.
+
+    Focus classes and their transitive ancestors (within this tree) get
+    the full body analysis; every other class records just its name and
+    bases, skipping the method-body walks entirely.
+
+    Args:
+        tree (ast.AST): The parsed module.
+        focus_classes (frozenset): Names of the focus classes.
+        out (dict): Dictionary to fill with class name -> class info.
+    """
+    nodes = {}
+    queue = deque([tree])
+    while queue:
+        node = queue.popleft()
+        if isinstance(node, ast.ClassDef):
+            nodes[node.name] = node
+        queue.extend(child for child in ast.iter_child_nodes(node)
+                     if isinstance(child, (ast.stmt, ast.excepthandler, ast.match_case)))
+
+    # Resolving bases is cheap, so do it for every class first, then chase
+    # the inheritance chains upward from the focus classes.
+    bases_by_name = {name: [_get_name(base) for base in node.bases]
+                     for name, node in nodes.items()}
+    needed = set()
+    stack = [c for c in focus_classes]
+    while stack:
+        name = stack.pop()
+        if name in needed:
+            continue
+        needed.add(name)
+        stack.extend(base for base in bases_by_name.get(name, ()) if base)
+
+    for name, node in nodes.items():
+        if name in needed:
+            out[name] = _analyze_class(node)
+        else:
+            class_info = ClassInfo()
+            class_info.bases = bases_by_name[name]
+            out[name] = class_info
+
+def _extract_with_tree_sitter(source):
+    """
+    Extract class information using the optional tree-sitter parser.
+
+    tree-sitter parses large files considerably faster than ast and its
+    cursor walk runs in native code. Only the node types the extractor
+    cares about are visited; semantics mirror the ast-based path.
+
+    Args:
+        source (bytes): The source code of the analyzed file.
+
+    Returns:
+        dict: Class name -> class info.
+
+    Raises:
+        ImportError: If tree-sitter or its Python grammar is missing.
+    """
+    import tree_sitter
+    import tree_sitter_python
+
+    parser = tree_sitter.Parser(tree_sitter.Language(tree_sitter_python.language()))
+    tree = parser.parse(source)
+    out = {}
+    stack = [tree.root_node]
+    while stack:
+        node = stack.pop()
+        if node.type == 'class_definition':
+            out[node.child_by_field_name('name').text.decode()] = _ts_analyze_class(node)
+        stack.extend(node.named_children)
+    return out
+
+def _ts_analyze_class(node):
+    # tree-sitter counterpart of _analyze_class.
+    class_info = ClassInfo()
+    superclasses = node.child_by_field_name('superclasses')
+    if superclasses is not None:
+        class_info.bases = [base.text.decode()
+                            for base in superclasses.named_children
+                            if base.type in ('identifier', 'attribute')]
+    body = node.child_by_field_name('body')
+    for body_item in body.named_children if body is not None else ():
+        if body_item.type == 'decorated_definition':
+            body_item = body_item.child_by_field_name('definition') or body_item
+        if body_item.type == 'function_definition':
+            # tree-sitter parses `async def` as a function_definition with
+            # a leading 'async' token; the ast path only handles plain
+            # FunctionDef, so skip those to keep the backends in agreement.
+            if any(child.type == 'async' for child in body_item.children):
+                continue
+            method_name = sys.intern(body_item.child_by_field_name('name').text.decode())
+            if not (method_name.startswith('__') and method_name.endswith('__')):
+                class_info.methods.add(method_name)
+                _ts_process_method(body_item, class_info)
+        elif body_item.type == 'expression_statement':
+            for expr in body_item.named_children:
+                # Chained assignments nest in tree-sitter: x = y = 1 puts
+                # the second assignment in the right field of the first,
+                # so chase rights to collect every target, mirroring the
+                # ast node's targets list.
+                while expr is not None and expr.type == 'assignment':
+                    _ts_collect_targets(expr.child_by_field_name('left'), class_info,
+                                        lambda t: t.type == 'identifier')
+                    expr = expr.child_by_field_name('right')
+    return class_info
+
+def _ts_collect_targets(target, class_info, accept):
+    # Record assignment targets, unpacking tuple/list patterns.
+    if target is None:
+        return
+    if target.type in ('pattern_list', 'tuple_pattern', 'list_pattern'):
+        for elt in target.named_children:
+            _ts_collect_targets(elt, class_info, accept)
+    elif accept(target):
+        name = target.text.decode()
+        if target.type == 'attribute':
+            name = name.rpartition('.')[2]
+        class_info.variables.add(sys.intern(name))
+
+def _ts_process_method(node, class_info):
+    # tree-sitter counterpart of _process_method: find self.<attr> targets,
+    # pruning nested functions and classes which shadow `self`.
+    def is_self_attr(t):
+        if t.type != 'attribute':
+            return False
+        obj = t.child_by_field_name('object')
+        return obj is not None and obj.type == 'identifier' and obj.text == b'self'
+
+    stack = list(node.child_by_field_name('body').named_children)
+    while stack:
+        stmt = stack.pop()
+        if stmt.type in ('function_definition', 'class_definition'):
+            continue
+        if stmt.type == 'assignment':
+            _ts_collect_targets(stmt.child_by_field_name('left'), class_info, is_self_attr)
+        stack.extend(stmt.named_children)
+
+def _extract_classdef(node):
+    """
+    Extract class information from a single top-level class subtree.
+
+    Args:
+        node (ast.ClassDef): The class definition node.
+
+    Returns:
+        dict: Class name -> class info for the class and any nested classes.
+    """
+    extracted = {}
+    extract_classes(node, extracted)
+    return extracted
+
+def _parse_one(input_file, use_cache=True, parallel_classes=False, focus_only=None):
+    """
+    Read, parse and extract class information from a single file.
+
+    Runs in a worker process when many files are analyzed, so errors are
+    returned rather than printed.
+
+    Args:
+        input_file (str): Path of the Python file to analyze.
+        use_cache (bool): Whether to use the on-disk extraction cache.
+        parallel_classes (bool): Whether a file with many top-level
+            classes may fan extraction out to worker processes. Only
+            safe when _parse_one itself runs in the main process.
+        focus_only (frozenset or None): When given, only these classes
+            and their ancestors get full body analysis; the cache and
+            the optional parse backends are bypassed since their results
+            cover every class.
+
+    Returns:
+        tuple: (classes dict or None, error message or None).
+    """
+    use_cache = use_cache and focus_only is None
+    try:
+        # One optimized syscall path; ast.parse accepts bytes directly.
+        source = Path(input_file).read_bytes()
+    except FileNotFoundError:
+        return None, f"Error: File '{input_file}' not found."
+    except OSError as e:
+        return None, f"Error reading '{input_file}': {e}"
+
+    if use_cache:
+        cached = load_cached_classes(source)
+        if cached is not None:
+            return cached, None
+
+    if focus_only is None and len(source) >= TREE_SITTER_MIN_BYTES:
+        # Prefer the optional tree-sitter backend for very large files;
+        # fall back to ast when it is not installed or fails.
+        try:
+            extracted = _extract_with_tree_sitter(source)
+        except Exception:
+            pass
+        else:
+            if use_cache:
+                store_cached_classes(source, extracted)
+            return extracted, None
+
+    try:
+        tree = ast.parse(source, filename=input_file)
+    except SyntaxError as e:
+        return None, f"Error parsing '{input_file}': {e}"
+
+    extracted = {}
+    if focus_only is not None:
+        _extract_focus_only(tree, focus_only, extracted)
+        return extracted, None
+    classdefs = ([n for n in tree.body if isinstance(n, ast.ClassDef)]
+                 if parallel_classes else [])
+    if len(classdefs) >= PARALLEL_MIN_CLASSES:
+        # One large file: the per-class traversals are independent, and
+        # AST nodes pickle cleanly, so split the tree across processes.
+        with ProcessPoolExecutor() as executor:
+            for part in executor.map(_extract_classdef, classdefs, chunksize=8):
+                extracted.update(part)
+        # Classes nested below other top-level statements still need the
+        # sequential walk over what remains of the module body.
+        remainder = ast.Module(
+            body=[n for n in tree.body if not isinstance(n, ast.ClassDef)],
+            type_ignores=[])
+        extract_classes(remainder, extracted)
+    else:
+        extract_classes(tree, extracted)
+    if use_cache:
+        store_cached_classes(source, extracted)
+    return extracted, None
+
 def main():
+    import argparse
+
     parser = argparse.ArgumentParser(description="Analyze Python class hierarchies and generate visualizations.")
     parser.add_argument(
         '--files', '-f',
@@ -133,116 +651,87 @@ def main():
         action='store_true',
         help='Include inherited methods and variables.'
     )
-    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Disable the on-disk cache of extracted class information.'
+    )
+    parser.add_argument(
+        '--focus-only',
+        action='store_true',
+        help='Skip body analysis for classes that are neither focus classes nor their ancestors (ancestors are resolved within each file).'
+    )
+
     args = parser.parse_args()
     
     input_files = args.files
     focus_classes = args.focus
     include_inherited = args.include_inherited
 
-    # Extract class hierarchy from all input files
+    # Extract class hierarchy from all input files. Parsing independent
+    # files is embarrassingly parallel, so fan out for larger file sets.
     classes = {}
-    for input_file in input_files:
-        try:
-            with open(input_file, 'r') as f:
-                source = f.read()
-        except FileNotFoundError:
-            print(f"Error: File '{input_file}' not found.")
-            continue
-        except Exception as e:
-            print(f"Error reading '{input_file}': {e}")
-            continue
-
-        try:
-            tree = ast.parse(source)
-        except SyntaxError as e:
-            print(f"Error parsing '{input_file}': {e}")
+    use_cache = not args.no_cache
+    focus_only = frozenset(focus_classes) if args.focus_only else None
+    if len(input_files) >= PARALLEL_MIN_FILES:
+        with ProcessPoolExecutor() as executor:
+            results = list(executor.map(
+                partial(_parse_one, use_cache=use_cache, focus_only=focus_only), input_files))
+    else:
+        results = [_parse_one(f, use_cache, parallel_classes=True, focus_only=focus_only)
+                   for f in input_files]
+    for extracted, error in results:
+        if error is not None:
+            print(error)
             continue
-
-        extractor = HierarchyExtractor()
-        extractor.visit(tree)
-        classes.update(extractor.classes)
+        classes.update(extracted)
     
     if not classes:
         print("No classes found in the provided input files.")
         return
 
-    # Write output to a text file
-    with open('output.txt', 'w') as output_file:
-        for class_name, class_info in classes.items():
-            output_file.write(f"Class: {class_name}\n")
-            if class_info['bases']:
-                output_file.write(f"  Bases: {', '.join(class_info['bases'])}\n")
-            output_file.write("  Methods:\n")
-            for method in sorted(class_info['methods']):
-                output_file.write(f"    {method}\n")
-            output_file.write("  Variables:\n")
-            for var_name in sorted(class_info['variables']):
-                output_file.write(f"    {var_name}\n")
-            output_file.write("\n")
+    # Write output to a text file; build the content in memory and write
+    # it in one call instead of many small writes.
+    chunks = []
+    for class_name, class_info in classes.items():
+        chunks.append(f"Class: {class_name}\n")
+        if class_info.bases:
+            chunks.append(f"  Bases: {', '.join(class_info.bases)}\n")
+        chunks.append("  Methods:\n")
+        for method in sorted(class_info.methods):
+            chunks.append(f"    {method}\n")
+        chunks.append("  Variables:\n")
+        for var_name in sorted(class_info.variables):
+            chunks.append(f"    {var_name}\n")
+        chunks.append("\n")
+    Path('output.txt').write_text("".join(chunks))
     
-    # Prepare data for focus classes
-    focus_methods = {}
-    focus_variables = {}
+    # Prepare sharing data for focus classes, shared by both visualizations
+    sharing = None
     if focus_classes:
         for class_name in focus_classes:
-            if class_name in classes:
-                methods = classes[class_name]['methods']
-                variables = classes[class_name]['variables']
-                if include_inherited:
-                    inherited_methods, inherited_variables = collect_inherited_elements(class_name, classes)
-                    methods = methods.union(inherited_methods)
-                    variables = variables.union(inherited_variables)
-                focus_methods[class_name] = methods
-                focus_variables[class_name] = variables
-            else:
+            if class_name not in classes:
                 print(f"Warning: Focus class '{class_name}' not found in the input files.")
-    
-        if not focus_methods:
+
+        sharing = compute_sharing(classes, focus_classes, include_inherited)
+        if not sharing.effective_methods:
             print("No valid focus classes found. Exiting.")
             return
-    
-        # Find shared methods and variables among all combinations
-        all_focus_methods = {}
-        all_focus_variables = {}
-        # Generate combinations of focus classes
-        for r in range(2, len(focus_classes)+1):
-            for combo in itertools.combinations(focus_classes, r):
-                methods_sets = [focus_methods[c] for c in combo if c in focus_methods]
-                variables_sets = [focus_variables[c] for c in combo if c in focus_variables]
-                common_methods = set.intersection(*methods_sets) if methods_sets else set()
-                common_variables = set.intersection(*variables_sets) if variables_sets else set()
-                if common_methods:
-                    all_focus_methods[combo] = common_methods
-                if common_variables:
-                    all_focus_variables[combo] = common_variables
-    
-        # Unique methods and variables for each focus class
-        unique_methods = {}
-        unique_variables = {}
-        for class_name in focus_classes:
-            methods_in_other_classes = set()
-            variables_in_other_classes = set()
-            for other in focus_classes:
-                if other != class_name and other in focus_methods:
-                    methods_in_other_classes.update(focus_methods[other])
-                    variables_in_other_classes.update(focus_variables[other])
-            unique_methods[class_name] = focus_methods[class_name] - methods_in_other_classes
-            unique_variables[class_name] = focus_variables[class_name] - variables_in_other_classes
-    
-    # Generate enhanced visualization
-    if focus_classes:
-        generate_enhanced_visualization(classes, focus_classes, include_inherited)
-    else:
-        print("No focus classes provided. Visualization requires at least one focus class.")
-    
-    # Generate original visualization
+
+    # Inheritance edges are identical in both visualizations
+    edges = collect_inheritance_edges(classes)
+
+    # Generate both visualizations, then render them with one dot call
     if focus_classes:
-        generate_original_visualization(classes, focus_classes, include_inherited)
+        gv_files = [
+            generate_enhanced_visualization(classes, focus_classes, include_inherited, sharing, edges),
+            generate_original_visualization(classes, focus_classes, include_inherited, sharing, edges),
+        ]
+        render_pdfs(gv_files)
     else:
         print("No focus classes provided. Visualization requires at least one focus class.")
 
-def generate_enhanced_visualization(classes, focus_classes, include_inherited=False, output_filename='class_hierarchy_enhanced.gv'):
+def generate_enhanced_visualization(classes, focus_classes, include_inherited=False, sharing=None, edges=None, output_filename='class_hierarchy_enhanced.gv'):
     """
     Generates the enhanced visualization with color-coded sections in class tables,
     indicating shared and unique methods/variables among focus classes.
@@ -251,168 +740,139 @@ def generate_enhanced_visualization(classes, focus_classes, include_inherited=Fa
         classes (dict): Dictionary containing class information.
         focus_classes (list): List of focus class names.
         include_inherited (bool): Whether to include inherited methods/variables.
+        sharing (SharingData): Precomputed sharing analysis; computed on demand if omitted.
+        edges (list): Precomputed (base, subclass) pairs; computed on demand if omitted.
         output_filename (str): The filename for the generated PDF.
     """
-    # Define color palette
-    color_palette = ['palegoldenrod', 'lightgreen', 'lightpink', 'lightcyan', 'lavender', 'lightcoral', 'aquamarine']
-    sharing_colors = {}
-    color_index = 0
+    if sharing is None:
+        sharing = compute_sharing(classes, focus_classes, include_inherited)
+    if edges is None:
+        edges = collect_inheritance_edges(classes)
+    all_focus_methods = sharing.all_focus_methods
+    all_focus_variables = sharing.all_focus_variables
+    unique_methods = sharing.unique_methods
+    unique_variables = sharing.unique_variables
+    sharing_colors = sharing.sharing_colors
+    focus_set = set(focus_classes)
+
+    # Index shared-member combinations by class once, so each class's
+    # label loop only visits the combinations it actually belongs to
+    # instead of scanning every combination.
+    method_combos_by_class = defaultdict(list)
+    for combo in all_focus_methods:
+        for c in combo:
+            method_combos_by_class[c].append(combo)
+    variable_combos_by_class = defaultdict(list)
+    for combo in all_focus_variables:
+        for c in combo:
+            variable_combos_by_class[c].append(combo)
 
-    # Prepare combinations of focus classes
-    all_focus_methods = {}
-    all_focus_variables = {}
-    for r in range(2, len(focus_classes)+1):
-        for combo in itertools.combinations(focus_classes, r):
-            methods_sets = [classes[c]['methods'] for c in combo if c in classes]
-            variables_sets = [classes[c]['variables'] for c in combo if c in classes]
-            if include_inherited:
-                methods_sets = [methods_sets[i].union(collect_inherited_elements(c, classes)[0]) for i, c in enumerate(combo)]
-                variables_sets = [variables_sets[i].union(collect_inherited_elements(c, classes)[1]) for i, c in enumerate(combo)]
-            common_methods = set.intersection(*methods_sets) if methods_sets else set()
-            common_variables = set.intersection(*variables_sets) if variables_sets else set()
-            if common_methods:
-                all_focus_methods[combo] = common_methods
-            if common_variables:
-                all_focus_variables[combo] = common_variables
-
-    # Unique methods and variables per class
-    unique_methods = {}
-    unique_variables = {}
+    # Sort each combination's display name once instead of per class.
+    combo_names = {combo: ', '.join(sorted(combo))
+                   for combo in all_focus_methods.keys() | all_focus_variables.keys()}
+
+    # Emit DOT source straight into a line buffer; the Digraph object
+    # model would allocate a Python object per node and edge only to
+    # serialize them again.
+    buf = ['// Class Hierarchy Enhanced', 'digraph {', '\trankdir=TB']
+
+    # Subgraph for focus classes
+    buf.append('\tsubgraph cluster_focus {')
+    buf.append('\t\tlabel="Focus Classes" color=blue')
+    buf.append('\t\tstyle=filled color=lightgrey')
     for class_name in focus_classes:
         if class_name not in classes:
-            unique_methods[class_name] = set()
-            unique_variables[class_name] = set()
             continue
-        other_classes = set(focus_classes) - {class_name}
-        methods_in_other_classes = set()
-        variables_in_other_classes = set()
-        for other in other_classes:
-            if other in classes:
-                methods_in_other_classes.update(classes[other]['methods'])
-                variables_in_other_classes.update(classes[other]['variables'])
-                if include_inherited:
-                    inherited_methods, inherited_variables = collect_inherited_elements(other, classes)
-                    methods_in_other_classes.update(inherited_methods)
-                    variables_in_other_classes.update(inherited_variables)
-        if include_inherited:
-            inherited_methods, inherited_variables = collect_inherited_elements(class_name, classes)
-            unique_methods[class_name] = classes[class_name]['methods'].union(inherited_methods) - methods_in_other_classes
-            unique_variables[class_name] = classes[class_name]['variables'].union(inherited_variables) - variables_in_other_classes
-        else:
-            unique_methods[class_name] = classes[class_name]['methods'] - methods_in_other_classes
-            unique_variables[class_name] = classes[class_name]['variables'] - variables_in_other_classes
+        class_info = classes[class_name]
+        parts = ["<<TABLE BORDER='0' CELLBORDER='1' CELLSPACING='0'>"]
+        parts.append(f"<TR><TD BGCOLOR='lightblue'><B>{class_name}</B></TD></TR>")
+        if class_info.bases:
+            bases = ', '.join(class_info.bases)
+            parts.append(f"<TR><TD><I>Bases: {bases}</I></TD></TR>")
 
-    # Assign colors to combinations
-    for combo in all_focus_methods.keys() | all_focus_variables.keys():
-        if combo not in sharing_colors:
-            sharing_colors[combo] = color_palette[color_index % len(color_palette)]
-            color_index += 1
+        # Shared Methods
+        for combo in method_combos_by_class.get(class_name, ()):
+            color = sharing_colors.get(combo, 'white')
+            combo_name = combo_names[combo]
+            if len(combo) == len(focus_classes):
+                section_title = "Methods shared among all focus classes"
+            else:
+                section_title = f"Methods shared among: {combo_name}"
+            parts.append(f"<TR><TD BGCOLOR='{color}'><U>{section_title}</U></TD></TR>")
+            for method in sharing.sorted_shared_methods[combo]:
+                parts.append(f"<TR><TD BGCOLOR='{color}'>{method}</TD></TR>")
 
-    # Create Graphviz Digraph
-    dot = graphviz.Digraph(comment='Class Hierarchy Enhanced', format='pdf')
-    dot.attr(rankdir='TB')  # Top to Bottom
+        # Unique Methods
+        if unique_methods.get(class_name):
+            parts.append(f"<TR><TD BGCOLOR='white'><U>Unique Methods</U></TD></TR>")
+            for method in sharing.sorted_unique_methods[class_name]:
+                parts.append(f"<TR><TD BGCOLOR='white'>{method}</TD></TR>")
 
-    # Create subgraph for focus classes
-    with dot.subgraph(name='cluster_focus') as focus_cluster:
-        focus_cluster.attr(label='Focus Classes', color='blue')
-        focus_cluster.attr(style='filled', color='lightgrey')
-        for class_name in focus_classes:
-            if class_name not in classes:
-                continue
-            class_info = classes[class_name]
-            if include_inherited:
-                inherited_methods, inherited_variables = collect_inherited_elements(class_name, classes)
-                methods = class_info['methods'].union(inherited_methods)
-                variables = class_info['variables'].union(inherited_variables)
+        # Shared Variables
+        for combo in variable_combos_by_class.get(class_name, ()):
+            color = sharing_colors.get(combo, 'white')
+            combo_name = combo_names[combo]
+            if len(combo) == len(focus_classes):
+                section_title = "Variables shared among all focus classes"
             else:
-                methods = class_info['methods']
-                variables = class_info['variables']
-            label = f"<<TABLE BORDER='0' CELLBORDER='1' CELLSPACING='0'>"
-            label += f"<TR><TD BGCOLOR='lightblue'><B>{class_name}</B></TD></TR>"
-            if class_info['bases']:
-                bases = ', '.join(class_info['bases'])
-                label += f"<TR><TD><I>Bases: {bases}</I></TD></TR>"
-
-            # Shared Methods
-            for combo, methods_shared in all_focus_methods.items():
-                if class_name in combo:
-                    color = sharing_colors.get(combo, 'white')
-                    combo_name = ', '.join(combo)
-                    if len(combo) == len(focus_classes):
-                        section_title = "Methods shared among all focus classes"
-                    else:
-                        section_title = f"Methods shared among: {combo_name}"
-                    label += f"<TR><TD BGCOLOR='{color}'><U>{section_title}</U></TD></TR>"
-                    for method in sorted(methods_shared):
-                        label += f"<TR><TD BGCOLOR='{color}'>{method}</TD></TR>"
-
-            # Unique Methods
-            if unique_methods.get(class_name):
-                label += f"<TR><TD BGCOLOR='white'><U>Unique Methods</U></TD></TR>"
-                for method in sorted(unique_methods[class_name]):
-                    label += f"<TR><TD BGCOLOR='white'>{method}</TD></TR>"
-
-            # Shared Variables
-            for combo, variables_shared in all_focus_variables.items():
-                if class_name in combo:
-                    color = sharing_colors.get(combo, 'white')
-                    combo_name = ', '.join(combo)
-                    if len(combo) == len(focus_classes):
-                        section_title = "Variables shared among all focus classes"
-                    else:
-                        section_title = f"Variables shared among: {combo_name}"
-                    label += f"<TR><TD BGCOLOR='{color}'><U>{section_title}</U></TD></TR>"
-                    for var in sorted(variables_shared):
-                        label += f"<TR><TD BGCOLOR='{color}'>{var}</TD></TR>"
-
-            # Unique Variables
-            if unique_variables.get(class_name):
-                label += f"<TR><TD BGCOLOR='white'><U>Unique Variables</U></TD></TR>"
-                for var in sorted(unique_variables[class_name]):
-                    label += f"<TR><TD BGCOLOR='white'>{var}</TD></TR>"
-
-            label += "</TABLE>>"
-            focus_cluster.node(class_name, label=label, shape='plaintext')
-
-    # Create subgraph for other classes
-    with dot.subgraph(name='cluster_non_focus') as non_focus_cluster:
-        non_focus_cluster.attr(label='Other Classes', color='grey')
-        non_focus_cluster.attr(style='filled', color='white')
-        for class_name, class_info in classes.items():
-            if class_name in focus_classes:
-                continue
-            label = f"<<TABLE BORDER='0' CELLBORDER='1' CELLSPACING='0'>"
-            label += f"<TR><TD BGCOLOR='lightgrey'><B>{class_name}</B></TD></TR>"
-            if class_info['bases']:
-                bases = ', '.join(class_info['bases'])
-                label += f"<TR><TD><I>Bases: {bases}</I></TD></TR>"
-
-            # Methods
-            if class_info['methods']:
-                label += f"<TR><TD BGCOLOR='white'><U>Methods</U></TD></TR>"
-                for method in sorted(class_info['methods']):
-                    label += f"<TR><TD>{method}</TD></TR>"
-
-            # Variables
-            if class_info['variables']:
-                label += f"<TR><TD BGCOLOR='white'><U>Variables</U></TD></TR>"
-                for var in sorted(class_info['variables']):
-                    label += f"<TR><TD>{var}</TD></TR>"
-
-            label += "</TABLE>>"
-            non_focus_cluster.node(class_name, label=label, shape='plaintext')
+                section_title = f"Variables shared among: {combo_name}"
+            parts.append(f"<TR><TD BGCOLOR='{color}'><U>{section_title}</U></TD></TR>")
+            for var in sharing.sorted_shared_variables[combo]:
+                parts.append(f"<TR><TD BGCOLOR='{color}'>{var}</TD></TR>")
 
-    # Add inheritance edges
+        # Unique Variables
+        if unique_variables.get(class_name):
+            parts.append(f"<TR><TD BGCOLOR='white'><U>Unique Variables</U></TD></TR>")
+            for var in sharing.sorted_unique_variables[class_name]:
+                parts.append(f"<TR><TD BGCOLOR='white'>{var}</TD></TR>")
+
+        parts.append("</TABLE>>")
+        label = "".join(parts)
+        buf.append(f'\t\t"{class_name}" [label={label} shape=plaintext]')
+
+    buf.append('\t}')
+
+    # Subgraph for other classes
+    buf.append('\tsubgraph cluster_non_focus {')
+    buf.append('\t\tlabel="Other Classes" color=grey')
+    buf.append('\t\tstyle=filled color=white')
     for class_name, class_info in classes.items():
-        for base in class_info['bases']:
-            if base and base in classes:
-                dot.edge(base, class_name, label='inherits', color='black')
+        if class_name in focus_set:
+            continue
+        parts = ["<<TABLE BORDER='0' CELLBORDER='1' CELLSPACING='0'>"]
+        parts.append(f"<TR><TD BGCOLOR='lightgrey'><B>{class_name}</B></TD></TR>")
+        if class_info.bases:
+            bases = ', '.join(class_info.bases)
+            parts.append(f"<TR><TD><I>Bases: {bases}</I></TD></TR>")
+
+        # Methods
+        if class_info.methods:
+            parts.append(f"<TR><TD BGCOLOR='white'><U>Methods</U></TD></TR>")
+            for method in sorted(class_info.methods):
+                parts.append(f"<TR><TD>{method}</TD></TR>")
+
+        # Variables
+        if class_info.variables:
+            parts.append(f"<TR><TD BGCOLOR='white'><U>Variables</U></TD></TR>")
+            for var in sorted(class_info.variables):
+                parts.append(f"<TR><TD>{var}</TD></TR>")
+
+        parts.append("</TABLE>>")
+        label = "".join(parts)
+        buf.append(f'\t\t"{class_name}" [label={label} shape=plaintext]')
+    buf.append('\t}')
+
+    # Add inheritance edges
+    for base, class_name in edges:
+        buf.append(f'\t"{base}" -> "{class_name}" [label=inherits color=black]')
+    buf.append('}')
 
     # Render and save the enhanced visualization
-    dot.render(output_filename, view=False)
+    Path(output_filename).write_text('\n'.join(buf) + '\n')
     print(f"Enhanced visualization saved as '{output_filename}'.")
+    return output_filename
 
-def generate_original_visualization(classes, focus_classes, include_inherited, output_filename='class_hierarchy_original.gv'):
+def generate_original_visualization(classes, focus_classes, include_inherited, sharing=None, edges=None, output_filename='class_hierarchy_original.gv'):
     """
     Generates the original visualization with lines connecting classes to methods and variables.
     Shared methods/variables are colored differently and arranged vertically to reduce width.
@@ -421,66 +881,24 @@ def generate_original_visualization(classes, focus_classes, include_inherited, o
         classes (dict): Dictionary containing class information.
         focus_classes (list): List of focus class names.
         include_inherited (bool): Whether to include inherited methods/variables.
+        sharing (SharingData): Precomputed sharing analysis; computed on demand if omitted.
+        edges (list): Precomputed (base, subclass) pairs; computed on demand if omitted.
         output_filename (str): The filename for the generated PDF.
     """
-    # Define color palette
-    color_palette = ['palegoldenrod', 'lightgreen', 'lightpink', 'lightcyan', 'lavender', 'lightcoral', 'aquamarine']
-    sharing_colors = {}
-    color_index = 0
-
-    # Prepare combinations of focus classes
-    all_focus_methods = {}
-    all_focus_variables = {}
-    for r in range(2, len(focus_classes)+1):
-        for combo in itertools.combinations(focus_classes, r):
-            methods_sets = [classes[c]['methods'] for c in combo if c in classes]
-            variables_sets = [classes[c]['variables'] for c in combo if c in classes]
-            if include_inherited:
-                methods_sets = [methods_sets[i].union(collect_inherited_elements(c, classes)[0]) for i, c in enumerate(combo)]
-                variables_sets = [variables_sets[i].union(collect_inherited_elements(c, classes)[1]) for i, c in enumerate(combo)]
-            common_methods = set.intersection(*methods_sets) if methods_sets else set()
-            common_variables = set.intersection(*variables_sets) if variables_sets else set()
-            if common_methods:
-                all_focus_methods[combo] = common_methods
-            if common_variables:
-                all_focus_variables[combo] = common_variables
-
-    # Unique methods and variables per class
-    unique_methods = {}
-    unique_variables = {}
-    for class_name in focus_classes:
-        if class_name not in classes:
-            unique_methods[class_name] = set()
-            unique_variables[class_name] = set()
-            continue
-        other_classes = set(focus_classes) - {class_name}
-        methods_in_other_classes = set()
-        variables_in_other_classes = set()
-        for other in other_classes:
-            if other in classes:
-                methods_in_other_classes.update(classes[other]['methods'])
-                variables_in_other_classes.update(classes[other]['variables'])
-                if include_inherited:
-                    inherited_methods, inherited_variables = collect_inherited_elements(other, classes)
-                    methods_in_other_classes.update(inherited_methods)
-                    variables_in_other_classes.update(inherited_variables)
-        if include_inherited:
-            inherited_methods, inherited_variables = collect_inherited_elements(class_name, classes)
-            unique_methods[class_name] = classes[class_name]['methods'].union(inherited_methods) - methods_in_other_classes
-            unique_variables[class_name] = classes[class_name]['variables'].union(inherited_variables) - variables_in_other_classes
-        else:
-            unique_methods[class_name] = classes[class_name]['methods'] - methods_in_other_classes
-            unique_variables[class_name] = classes[class_name]['variables'] - variables_in_other_classes
-
-    # Assign colors to combinations
-    for combo in all_focus_methods.keys() | all_focus_variables.keys():
-        if combo not in sharing_colors:
-            sharing_colors[combo] = color_palette[color_index % len(color_palette)]
-            color_index += 1
+    if sharing is None:
+        sharing = compute_sharing(classes, focus_classes, include_inherited)
+    if edges is None:
+        edges = collect_inheritance_edges(classes)
+    all_focus_methods = sharing.all_focus_methods
+    all_focus_variables = sharing.all_focus_variables
+    unique_methods = sharing.unique_methods
+    unique_variables = sharing.unique_variables
+    sharing_colors = sharing.sharing_colors
+    inherited = sharing.inherited
 
-    # Create Graphviz Digraph
-    dot_original = graphviz.Digraph(comment='Class Hierarchy Original', format='pdf')
-    dot_original.attr(rankdir='TB')  # Top to Bottom
+    # Emit DOT source straight into a line buffer, as in the enhanced
+    # visualization.
+    buf = ['// Class Hierarchy Original', 'digraph {', '\trankdir=TB']
 
     # Define node styles
     focus_class_color = 'lightblue'
@@ -491,18 +909,10 @@ def generate_original_visualization(classes, focus_classes, include_inherited, o
     # Add focus class nodes
     for class_name in focus_classes:
         if class_name in classes:
-            dot_original.node(class_name, shape='box', style='filled', fillcolor=focus_class_color)
+            buf.append(f'\t"{class_name}" [shape=box style=filled fillcolor={focus_class_color}]')
         else:
             continue
 
-    # Collect shared methods and variables
-    if include_inherited and focus_classes:
-        shared_methods = set.intersection(*(classes[c]['methods'].union(collect_inherited_elements(c, classes)[0]) for c in focus_classes))
-        shared_variables = set.intersection(*(classes[c]['variables'].union(collect_inherited_elements(c, classes)[1]) for c in focus_classes))
-    else:
-        shared_methods = set.intersection(*(classes[c]['methods'] for c in focus_classes)) if len(focus_classes) > 0 else set()
-        shared_variables = set.intersection(*(classes[c]['variables'] for c in focus_classes)) if len(focus_classes) > 0 else set()
-
     # Add shared method nodes
     added_methods = set()
     for combo, methods in all_focus_methods.items():
@@ -510,25 +920,24 @@ def generate_original_visualization(classes, focus_classes, include_inherited, o
         for method in methods:
             if method not in added_methods:
                 node_color = color
-                dot_original.node(method, shape='ellipse', style='filled', fillcolor=node_color)
+                buf.append(f'\t"{method}" [shape=ellipse style=filled fillcolor={node_color}]')
                 added_methods.add(method)
             for class_name in combo:
                 # Determine if the method is inherited
                 is_inherited = False
-                if include_inherited and method not in classes[class_name]['methods']:
-                    inherited_methods, _ = collect_inherited_elements(class_name, classes)
-                    if method in inherited_methods:
+                if include_inherited and method not in classes[class_name].methods:
+                    if method in inherited[class_name][0]:
                         is_inherited = True
                 edge_color = 'green'
                 pen_width = '2' if is_inherited else '1'
-                dot_original.edge(class_name, method, color=edge_color, penwidth=pen_width)
+                buf.append(f'\t"{class_name}" -> "{method}" [color={edge_color} penwidth={pen_width}]')
 
     # Add unique method nodes
     for class_name in focus_classes:
         for method in unique_methods[class_name]:
             method_node = f"{method}_{class_name}"
-            dot_original.node(method_node, shape='ellipse', style='filled', fillcolor=unique_method_color)
-            dot_original.edge(class_name, method_node, color='black')
+            buf.append(f'\t"{method_node}" [shape=ellipse style=filled fillcolor={unique_method_color}]')
+            buf.append(f'\t"{class_name}" -> "{method_node}" [color=black]')
 
     # Add shared variable nodes
     added_variables = set()
@@ -537,52 +946,73 @@ def generate_original_visualization(classes, focus_classes, include_inherited, o
         for var in variables:
             if var not in added_variables:
                 node_color = color
-                dot_original.node(var, shape='diamond', style='filled', fillcolor=node_color)
+                buf.append(f'\t"{var}" [shape=diamond style=filled fillcolor={node_color}]')
                 added_variables.add(var)
             for class_name in combo:
                 # Determine if the variable is inherited
                 is_inherited = False
-                if include_inherited and var not in classes[class_name]['variables']:
-                    _, inherited_variables = collect_inherited_elements(class_name, classes)
-                    if var in inherited_variables:
+                if include_inherited and var not in classes[class_name].variables:
+                    if var in inherited[class_name][1]:
                         is_inherited = True
                 edge_color = 'blue'
                 pen_width = '2' if is_inherited else '1'
-                dot_original.edge(class_name, var, color=edge_color, penwidth=pen_width)
+                buf.append(f'\t"{class_name}" -> "{var}" [color={edge_color} penwidth={pen_width}]')
 
     # Add unique variable nodes
     for class_name in focus_classes:
         for var in unique_variables[class_name]:
             var_node = f"{var}_{class_name}"
-            dot_original.node(var_node, shape='diamond', style='filled', fillcolor=unique_variable_color)
-            dot_original.edge(class_name, var_node, color='black')
+            buf.append(f'\t"{var_node}" [shape=diamond style=filled fillcolor={unique_variable_color}]')
+            buf.append(f'\t"{class_name}" -> "{var_node}" [color=black]')
 
     # Arrange nodes to prevent wide graph
     # Group shared methods and variables
-    with dot_original.subgraph() as s:
-        s.attr(rank='same')
-        for node in added_methods | added_variables:
-            s.node(node)
+    buf.append('\t{')
+    buf.append('\t\trank=same')
+    for node in added_methods | added_variables:
+        buf.append(f'\t\t"{node}"')
+    buf.append('\t}')
     # Group unique methods and variables under their classes
     for class_name in focus_classes:
-        with dot_original.subgraph() as s:
-            s.attr(rank='same')
-            for method in unique_methods[class_name]:
-                method_node = f"{method}_{class_name}"
-                s.node(method_node)
-            for var in unique_variables[class_name]:
-                var_node = f"{var}_{class_name}"
-                s.node(var_node)
+        buf.append('\t{')
+        buf.append('\t\trank=same')
+        for method in unique_methods[class_name]:
+            buf.append(f'\t\t"{method}_{class_name}"')
+        for var in unique_variables[class_name]:
+            buf.append(f'\t\t"{var}_{class_name}"')
+        buf.append('\t}')
 
     # Add inheritance edges
-    for class_name, class_info in classes.items():
-        for base in class_info['bases']:
-            if base and base in classes:
-                dot_original.edge(base, class_name, label='inherits', color='black')
+    for base, class_name in edges:
+        buf.append(f'\t"{base}" -> "{class_name}" [label=inherits color=black]')
+    buf.append('}')
 
     # Render the original graph to a file
-    dot_original.render(output_filename, view=False)
+    Path(output_filename).write_text('\n'.join(buf) + '\n')
     print(f"Original visualization saved as '{output_filename}'.")
+    return output_filename
+
+def render_pdfs(gv_files):
+    """
+    Render DOT files to PDF with a single `dot` invocation.
+
+    Passing every graph to one subprocess amortizes process startup and
+    font initialization across all outputs instead of paying it per graph.
+
+    Args:
+        gv_files (list): Paths of DOT files to render; `<path>.pdf` is
+            written next to each.
+    """
+    import subprocess
+
+    if not gv_files:
+        return
+    try:
+        subprocess.run(['dot', '-Tpdf', '-O', *gv_files], check=True)
+    except FileNotFoundError:
+        print("Warning: 'dot' executable not found; DOT files were written but not rendered to PDF.")
+    except subprocess.CalledProcessError as e:
+        print(f"Warning: 'dot' exited with status {e.returncode}; PDF output may be incomplete.")
 
 def generate_visualizations(classes, focus_classes, include_inherited=False):
     """
@@ -593,8 +1023,12 @@ def generate_visualizations(classes, focus_classes, include_inherited=False):
         focus_classes (list): List of focus class names.
         include_inherited (bool): Whether to include inherited methods/variables.
     """
-    generate_enhanced_visualization(classes, focus_classes, include_inherited, 'class_hierarchy_enhanced.gv')
-    generate_original_visualization(classes, focus_classes, include_inherited, 'class_hierarchy_original.gv')
+    sharing = compute_sharing(classes, focus_classes, include_inherited)
+    edges = collect_inheritance_edges(classes)
+    render_pdfs([
+        generate_enhanced_visualization(classes, focus_classes, include_inherited, sharing, edges, 'class_hierarchy_enhanced.gv'),
+        generate_original_visualization(classes, focus_classes, include_inherited, sharing, edges, 'class_hierarchy_original.gv'),
+    ])
 
 if __name__ == "__main__":
     main()